@@ -12,8 +12,12 @@ import tkinter.scrolledtext as scrolledtext
 import os
 import sys
 import threading
-import io
+import queue
 import re
+import functools
+import itertools
+import hashlib
+from collections import OrderedDict
 import json
 import traceback
 
@@ -31,18 +35,167 @@ from ide_components import (
     FindReplaceDialog
 )
 
+# Extra startup diagnostics are only printed when DOROLANG_DEBUG is set
+DEBUG_MODE = bool(os.environ.get("DOROLANG_DEBUG"))
+
+# Toggle Comment patterns; [^\S\n] is whitespace that stays within a line
+CODE_LINE_START = re.compile(r'^(?=[^\S\n]*\S)', re.MULTILINE)         # non-blank line
+UNCOMMENTED_LINE = re.compile(r'^[^\S\n]*[^#\s]', re.MULTILINE)         # code not starting with #
+COMMENT_MARK = re.compile(r'^([^\S\n]*)# ?', re.MULTILINE)               # leading "# "
+
+# Fixed texts live at module level with the About text below
+WELCOME_TEMPLATE = '''# Welcome to DoroLang!
+# New features: boolean values, logic, conditionals
+
+say "Hello, DoroLang!"
+
+# Try the new features:
+kas name = "Programmer"
+kas is_learning = true
+
+if (is_learning) {
+    say name + " is learning DoroLang!"
+} else {
+    say name + " already knows DoroLang"
+}
+'''
+
+SYNTAX_HELP_TEXT = """DoroLang v1.3 - Syntax Help
+
+BASIC CONSTRUCTS:
+• say "text"              - output text
+• kas variable = value    - declare variable
+• input("prompt")         - get user input
+
+DATA TYPES:
+• Numbers: 42, 3.14
+• Strings: "hello", 'world'
+• Booleans: true, false
+
+OPERATORS:
+• Arithmetic: +, -, *, /, %
+• Comparison: ==, !=, <, >, <=, >=
+• Logical: and, or, not
+
+CONDITIONAL CONSTRUCTS:
+if (condition) {
+    # code if true
+} else {
+    # code if false
+}
+
+COMMENTS:
+# This is a comment
+
+EXAMPLES:
+kas age = 25
+if (age >= 18) {
+    say "Adult"
+} else {
+    say "Minor"
+}
+
+kas result = (age > 20) and (age < 30)
+say "Age between 20 and 30: " + result
+
+kas name = input("What is your name? ")
+say "Hello, " + name + "!"
+"""
+
+SHORTCUTS_TEXT = """DoroLang IDE Keyboard Shortcuts
+
+FILES:
+Ctrl+N        - New file
+Ctrl+T        - New from template
+Ctrl+O        - Open file
+Ctrl+S        - Save
+Ctrl+Shift+S  - Save as
+
+EDITING:
+Ctrl+Z        - Undo
+Ctrl+Y        - Redo
+Ctrl+X        - Cut
+Ctrl+C        - Copy
+Ctrl+V        - Paste
+Ctrl+A        - Select all
+Ctrl+/        - Comment
+Ctrl+Space    - Autocomplete
+
+EXECUTION:
+F5            - Run code
+F9            - Run selection
+"""
+
+# Module state is known at import time, so the About text is built once
+ABOUT_TEXT = f"""DoroLang IDE
+Mode: {'Full Mode' if DOROLANG_MODULES_OK else 'Demo Mode'}
+
+Integrated Development Environment 
+for DoroLang Programming Language
+
+Author: Dorofii Karnaukh
+Year: 2024-2025
+
+Key Features:
+✅ Full-featured editor with syntax highlighting
+✅ Multi-file support with tabs
+✅ File explorer with management (create/delete)
+✅ Light and dark themes
+✅ Interactive output console
+
+DoroLang - simple and powerful programming 
+language for learning!"""
+
+CRITICAL_ERROR_TEMPLATE = """Critical error launching Enhanced IDE:
+
+Error: {error}
+
+Details:
+- Python: {python_version}
+- Working directory: {working_dir}
+- DoroLang modules: {modules_status}
+
+Check:
+1. Are all required files in the folder?
+2. Are all dependencies installed?
+3. Console output for details
+
+Full traceback printed to console."""
+
+
 class DoroLangIDE(tk.Tk):
     def setup_dorolang_input(self):
         import interpreter
         from tkinter import simpledialog
         def dorolang_input_gui(prompt: str) -> str:
             # Open dialog and return result immediately
-            return simpledialog.askstring("Input", prompt, parent=self)
+            if threading.current_thread() is threading.main_thread():
+                return simpledialog.askstring("Input", prompt, parent=self)
+            # Dialogs must be opened by the Tk thread; the worker waits for the answer
+            answer = queue.Queue(maxsize=1)
+            def ask():
+                result = None
+                try:
+                    result = simpledialog.askstring("Input", prompt, parent=self)
+                finally:
+                    answer.put(result)
+            self.call_in_ui(ask)
+            return answer.get()
         interpreter.dorolang_input = dorolang_input_gui
     """Main class for enhanced DoroLang IDE"""
+
+    # Number of parsed programs kept for repeated runs of the same code
+    AST_CACHE_SIZE = 32
+    # Runs after which a cached program is replaced by its optimized AST
+    HOT_RUN_THRESHOLD = 3
+    # ms between checks for calls queued by execution threads, as Console.DRAIN_INTERVAL
+    UI_POLL_INTERVAL = 16
     
     def __init__(self):
         super().__init__()
+        # Execution threads never call Tk themselves; they queue calls for the Tk thread
+        self.ui_calls = queue.Queue()
+        self.after(self.UI_POLL_INTERVAL, self._poll_ui_calls)
         self.setup_dorolang_input()
         self.setup_fonts()
         try:
@@ -65,11 +218,29 @@ class DoroLangIDE(tk.Tk):
             ''')
             if DOROLANG_MODULES_OK and Interpreter:
                 self.dorolang_interpreter = Interpreter()
+                # Runs happen on the worker thread; _execute_code echoes the output itself
+                self.dorolang_interpreter.echo = False
                 print("✅ Using real DoroLang interpreter")
             else:
                 self.dorolang_interpreter = MockInterpreter()
                 print("⚠️ Using demo mode (DoroLang modules not loaded)")
             
+            self.ast_cache = OrderedDict()
+            self.ast_cache_lock = threading.Lock()
+            # One lexer reused for every run; runs may come from several threads
+            self.lexer = Lexer("") if DOROLANG_MODULES_OK else None
+            self.lexer_lock = threading.Lock()
+            # Exception type -> reporter, one dict lookup instead of an isinstance ladder
+            self.error_reporters = {
+                LexerError: self._report_lexer_error,
+                ParseError: self._report_parse_error,
+                DoroRuntimeError: self._report_runtime_error,
+            } if DOROLANG_MODULES_OK else {}
+            # One persistent worker owns the interpreter and executes queued jobs in order
+            self.run_queue = queue.Queue()
+            self.run_worker = threading.Thread(target=self._run_worker_loop, daemon=True)
+            self.run_worker.start()
+            
             # Settings
             self.current_theme = 'light' # Default theme
             self.last_opened_folder = None
@@ -77,6 +248,8 @@ class DoroLangIDE(tk.Tk):
             self.find_window = None
             self.editors = {}
             self.recent_files = []
+            self.settings_dirty = False # Set when a persisted setting changes
+            self.status_job = None
             self.load_settings()
             self.theme_var = tk.StringVar(value=self.current_theme)
             
@@ -406,22 +579,7 @@ class DoroLangIDE(tk.Tk):
     
     def apply_welcome_template(self, editor):
         """Applies welcome template to editor"""
-        welcome_template = '''# Welcome to DoroLang!
-# New features: boolean values, logic, conditionals
-
-say "Hello, DoroLang!"
-
-# Try the new features:
-kas name = "Programmer"
-kas is_learning = true
-
-if (is_learning) {
-    say name + " is learning DoroLang!"
-} else {
-    say name + " already knows DoroLang"
-}
-'''
-        editor.set_text(welcome_template)
+        editor.set_text(WELCOME_TEMPLATE)
     
     def show_template_dialog(self):
         """Shows template selection dialog"""
@@ -439,8 +597,8 @@ if (is_learning) {
             listbox = tk.Listbox(dialog, font=("Arial", 10))
             listbox.pack(fill=tk.BOTH, expand=True, padx=10, pady=10)
             
-            for template_name in templates.keys():
-                listbox.insert(tk.END, template_name)
+            # One Tk call for all names
+            listbox.insert(tk.END, *templates)
             
             # Buttons
             button_frame = ttk.Frame(dialog)
@@ -486,34 +644,19 @@ if (is_learning) {
             
             # Get text
             text = editor.text_area.get(start_idx, end_idx)
-            lines = text.split('\n')
-            
-            # Check if we need to add or remove comments
-            all_commented = all(line.strip().startswith('#') or line.strip() == '' for line in lines)
-            
-            # Process each line
-            new_lines = []
-            for line in lines:
-                if all_commented:
-                    # Remove comment
-                    if line.strip().startswith('#'):
-                        # Remove first # and one space after it if present
-                        new_line = line.replace('#', '', 1)
-                        if new_line.startswith(' '):
-                            new_line = new_line[1:]
-                        new_lines.append(new_line)
-                    else:
-                        new_lines.append(line)
-                else:
-                    # Add comment
-                    if line.strip():  # Don't comment empty lines
-                        new_lines.append('# ' + line)
-                    else:
-                        new_lines.append(line)
+            
+            # Remove comments if every non-blank line is commented, otherwise add
+            # them to non-blank lines; each is one regex pass over the whole text
+            if UNCOMMENTED_LINE.search(text):
+                new_text = CODE_LINE_START.sub('# ', text)
+            else:
+                # Remove first # and one space after it if present
+                new_text = COMMENT_MARK.sub(r'\1', text)
             
             # Replace text
             editor.text_area.delete(start_idx, end_idx)
-            editor.text_area.insert(start_idx, '\n'.join(new_lines))
+            editor.text_area.insert(start_idx, new_text)
+            editor.text_changed()
             
         except Exception as e:
             print(f"Error toggling comment: {e}")
@@ -539,23 +682,16 @@ if (is_learning) {
             self.console.write_info("Checking syntax...")
             
             try:
-                # Only lexer and parser
-                lexer = Lexer(code)
-                tokens = lexer.tokenize()
-                
-                parser = Parser(tokens)
-                ast = parser.parse()
+                # Only lexer and parser; shares the AST cache with runs, so checking
+                # unchanged code is a lookup and a checked program runs without re-parsing
+                ast = self._parse_code(code, count_run=False)
                 
                 self.console.write_success(f"Syntax correct! Found {len(ast.statements)} statements")
                 
             except LexerError as e:
-                error_msg = f"Lexer error at line {e.line}, column {e.column}: {e.message}"
-                self.console.write_error(error_msg)
-                self._highlight_error_line(editor, e.line)
+                self._report_lexer_error(e)
             except ParseError as e:
-                error_msg = f"Syntax error at line {e.token.line}, column {e.token.column}: {e.message}"
-                self.console.write_error(error_msg)
-                self._highlight_error_line(editor, e.token.line)
+                self._report_parse_error(e)
             except Exception as e:
                 self.console.write_error(f"Unexpected error: {e}")
                 
@@ -565,75 +701,11 @@ if (is_learning) {
     
     def show_syntax_help(self):
         """Shows DoroLang syntax help"""
-        help_text = """DoroLang v1.3 - Syntax Help
-
-BASIC CONSTRUCTS:
-• say "text"              - output text
-• kas variable = value    - declare variable
-• input("prompt")         - get user input
-
-DATA TYPES:
-• Numbers: 42, 3.14
-• Strings: "hello", 'world'
-• Booleans: true, false
-
-OPERATORS:
-• Arithmetic: +, -, *, /, %
-• Comparison: ==, !=, <, >, <=, >=
-• Logical: and, or, not
-
-CONDITIONAL CONSTRUCTS:
-if (condition) {
-    # code if true
-} else {
-    # code if false
-}
-
-COMMENTS:
-# This is a comment
-
-EXAMPLES:
-kas age = 25
-if (age >= 18) {
-    say "Adult"
-} else {
-    say "Minor"
-}
-
-kas result = (age > 20) and (age < 30)
-say "Age between 20 and 30: " + result
-
-kas name = input("What is your name? ")
-say "Hello, " + name + "!"
-"""
-        messagebox.showinfo("DoroLang Syntax", help_text)
+        messagebox.showinfo("DoroLang Syntax", SYNTAX_HELP_TEXT)
     
     def show_shortcuts(self):
         """Shows keyboard shortcuts"""
-        shortcuts_text = """DoroLang IDE Keyboard Shortcuts
-
-FILES:
-Ctrl+N        - New file
-Ctrl+T        - New from template
-Ctrl+O        - Open file
-Ctrl+S        - Save
-Ctrl+Shift+S  - Save as
-
-EDITING:
-Ctrl+Z        - Undo
-Ctrl+Y        - Redo
-Ctrl+X        - Cut
-Ctrl+C        - Copy
-Ctrl+V        - Paste
-Ctrl+A        - Select all
-Ctrl+/        - Comment
-Ctrl+Space    - Autocomplete
-
-EXECUTION:
-F5            - Run code
-F9            - Run selection
-"""
-        messagebox.showinfo("Keyboard Shortcuts", shortcuts_text)
+        messagebox.showinfo("Keyboard Shortcuts", SHORTCUTS_TEXT)
     
     def show_settings(self):
         """Shows settings window"""
@@ -690,6 +762,7 @@ F9            - Run selection
                 # Apply theme
                 if theme_var.get() != self.current_theme:
                     self.current_theme = theme_var.get()
+                    self.settings_dirty = True
                     self.theme_var.set(self.current_theme)
                     self.apply_theme()
                 
@@ -705,8 +778,15 @@ F9            - Run selection
             print(f"Error showing settings: {e}")
             messagebox.showerror("Error", f"Failed to open settings: {e}")
     
+    def schedule_status_update(self):
+        """Coalesces status bar updates from bursts of key presses and clicks"""
+        if self.status_job:
+            self.after_cancel(self.status_job)
+        self.status_job = self.after(50, self.update_status)
+    
     def update_status(self):
         """Обновление строки состояния"""
+        self.status_job = None
         try:
             editor = self.get_current_editor()
             if editor:
@@ -753,7 +833,9 @@ F9            - Run selection
             path = filedialog.askdirectory(title="Select Project Folder")
             if path:
                 self.file_explorer.populate_tree(path)
-                self.last_opened_folder = path
+                if path != self.last_opened_folder:
+                    self.last_opened_folder = path
+                    self.settings_dirty = True
                 self.status_label.config(text=f"Folder opened: {os.path.basename(path)}")
         except Exception as e:
             print(f"Error opening folder: {e}")
@@ -801,10 +883,10 @@ F9            - Run selection
             if not editor: return False
 
             if editor.current_file:
-                with open(editor.current_file, 'w', encoding='utf-8') as f:
-                    f.write(editor.get_text())
+                with open(editor.current_file, 'w', encoding='utf-8', buffering=1 << 16) as f:
+                    f.writelines(editor.iter_text_chunks())
                 
-                editor.is_modified = False
+                editor.mark_saved()
                 self.update_title()
                 self.status_label.config(text=f"File saved: {os.path.basename(editor.current_file)}")
                 return True
@@ -831,11 +913,11 @@ F9            - Run selection
             )
             
             if filename:
-                with open(filename, 'w', encoding='utf-8') as f:
-                    f.write(editor.get_text())
+                with open(filename, 'w', encoding='utf-8', buffering=1 << 16) as f:
+                    f.writelines(editor.iter_text_chunks())
                 
                 editor.current_file = filename
-                editor.is_modified = False
+                editor.mark_saved()
                 self.update_title()
                 self.status_label.config(text=f"File saved: {os.path.basename(filename)}")
                 return True
@@ -950,10 +1032,8 @@ F9            - Run selection
             is_statement = re.match(r'^\s*(say|kas|if)', command)
             code_to_run = command if is_statement else f'say {command}'
 
-            # Запускаем в потоке, чтобы не блокировать GUI
-            thread = threading.Thread(target=self._execute_code, args=(code_to_run, True)) # True for interactive
-            thread.daemon = True
-            thread.start()
+            # Выполняем в рабочем потоке, чтобы не блокировать GUI
+            self.run_queue.put(functools.partial(self._execute_code, code_to_run, True)) # True for interactive
 
         except Exception as e:
             self.console.write_error(f"Interactive execution error: {e}")
@@ -969,7 +1049,9 @@ F9            - Run selection
                 self.console.write_warning("No open files to run!")
                 return
 
-            code = editor.get_text().strip()
+            # Tk may only be read on this thread; the one read serves both run and save
+            text = editor.get_text()
+            code = text.strip()
             if not code:
                 self.console.write_warning("No code to execute!")
                 return
@@ -980,15 +1062,16 @@ F9            - Run selection
             # Auto-save before running if file is modified
             if editor.is_modified and editor.current_file:
                 try:
-                    with open(editor.current_file, 'w', encoding='utf-8') as f:
-                        f.write(editor.get_text())
-                    editor.is_modified = False
+                    with open(editor.current_file, 'w', encoding='utf-8', buffering=1 << 16) as f:
+                        f.write(text)
+                    editor.mark_saved()
                     self.update_title()
                 except Exception as e:
                     self.console.write_warning(f"Auto-save failed: {e}")
 
-            # Run through after to avoid blocking main thread and work correctly with dialogs
-            self.after(0, lambda: self._execute_code(code, False))
+            # Run on the worker so the window stays responsive; input() dialogs
+            # are opened on the Tk thread by dorolang_input_gui
+            self.run_queue.put(functools.partial(self._execute_code, code, False))
             
         except Exception as e:
             print(f"Error running code: {e}")
@@ -1007,9 +1090,7 @@ F9            - Run selection
                 self.console.clear()
                 self.console.write_info("Running selected code...")
                 
-                thread = threading.Thread(target=self._execute_code, args=(selected_text, False))
-                thread.daemon = True
-                thread.start()
+                self.run_queue.put(functools.partial(self._execute_code, selected_text, False))
             else:
                 self.console.write_warning("No selected text!")
         except tk.TclError:
@@ -1024,62 +1105,145 @@ F9            - Run selection
             if not DOROLANG_MODULES_OK:
                 # Demo mode
                 output = self.dorolang_interpreter.interpret(code)
-                for line in output:
-                    self.console.write(line + "\n", "warning")
+                self.console.write_many([(line + "\n", "warning") for line in output])
                 return
             
-            # Create DoroLang component instances
-            lexer = Lexer(code)
-            tokens = lexer.tokenize()
-            
-            parser = Parser(tokens)
-            ast = parser.parse()
+            ast = self._parse_code(code)
             
-            # Execute code
-            output = self.dorolang_interpreter.interpret(ast)
+            # Execute code. The interpreter's own echo is off, so the process-wide
+            # stdout is never swapped; the collected lines, including those of a
+            # run that failed halfway, go to the terminal in one write
+            try:
+                output = self.dorolang_interpreter.interpret(ast)
+            finally:
+                echo = self.dorolang_interpreter.output
+                if echo and sys.stdout:
+                    sys.stdout.write("\n".join(echo) + "\n")
             
-            # Output result
+            # Output result, sent to the console as one batch
             if output:
+                lines = []
                 for line in output:
-                    # In interactive mode, don't show error icon as it's already in tag
-                    if "❌" in line and not interactive:
-                        self.console.write(line + "\n", "error")
+                    if "❌" not in line:
+                        lines.append((line + "\n", "output"))
+                    elif not interactive:
+                        lines.append((line + "\n", "error"))
                     else:
-                        # Remove icon as tag already exists
-                        clean_line = line.replace("❌ ", "") if "❌" in line else line
-                        self.console.write(clean_line + "\n", "output")
+                        # In interactive mode, don't show error icon as it's already in tag
+                        lines.append((line.replace("❌ ", "") + "\n", "output"))
+                self.console.write_many(lines)
             
             # In interactive mode, don't show statistics to avoid cluttering output
             if not interactive:
-                variables = self.dorolang_interpreter.get_variables()
-                if variables:
-                    self.console.write_info(f"Variables in memory: {len(variables)}")
+                variable_count = self.dorolang_interpreter.variable_count()
+                if variable_count:
+                    self.console.write_info(f"Variables in memory: {variable_count}")
                 self.console.write_success("Execution completed!")
             
         except Exception as e:
-            editor = self.get_current_editor()
-            
             if DOROLANG_MODULES_OK:
-                if isinstance(e, LexerError):
-                    error_msg = f"Lexer error at line {e.line}, column {e.column}: {e.message}"
-                    self.console.write_error(error_msg)
-                    if editor:
-                        self._highlight_error_line(editor, e.line)
-                elif isinstance(e, ParseError):
-                    error_msg = f"Syntax error at line {e.token.line}, column {e.token.column}: {e.message}"
-                    self.console.write_error(error_msg)
-                    if editor:
-                        self._highlight_error_line(editor, e.token.line)
-                elif isinstance(e, DoroRuntimeError):
-                    self.console.write_error(f"Runtime error: {e.message}")
-                else:
-                    self.console.write_error(f"Unexpected error: {e}")
+                report = self.error_reporters.get(type(e), self._report_unexpected_error)
+                report(e)
             else:
                 self.console.write_error(f"Execution error: {e}")
             
             print(f"Error executing code: {e}")
-            traceback.print_exc()
     
+    def _run_worker_loop(self):
+        """Runs queued jobs one after another until the None sentinel arrives"""
+        while True:
+            job = self.run_queue.get()
+            if job is None:
+                break
+            try:
+                job()
+            except Exception as e:
+                print(f"Run worker error: {e}")
+
+    def _report_lexer_error(self, e):
+        """Reports LexerError and marks its line"""
+        self.console.write_error(f"Lexer error at line {e.line}, column {e.column}: {e.message}")
+        self._highlight_current_error_line(e.line)
+
+    def _report_parse_error(self, e):
+        """Reports ParseError and marks its line"""
+        self.console.write_error(f"Syntax error at line {e.token.line}, column {e.token.column}: {e.message}")
+        self._highlight_current_error_line(e.token.line)
+
+    def _report_runtime_error(self, e):
+        """Reports DoroLang runtime error"""
+        self.console.write_error(f"Runtime error: {e.message}")
+
+    def _report_unexpected_error(self, e):
+        """Reports any other exception"""
+        self.console.write_error(f"Unexpected error: {e}")
+        # The console already shows the message; the traceback is for debugging only
+        # and is formatted off the run's path
+        if DEBUG_MODE:
+            threading.Thread(target=traceback.print_exception, args=(type(e), e, e.__traceback__), daemon=True).start()
+
+    def _parse_code(self, code, count_run=True):
+        """Lexes and parses code, reusing the AST when the same code is run or checked again"""
+        key = hashlib.blake2b(code.encode('utf-8'), digest_size=16).digest()
+        with self.ast_cache_lock:
+            entry = self.ast_cache.get(key)
+            if entry is not None:
+                self.ast_cache.move_to_end(key)
+                if count_run:
+                    entry[2] += 1
+
+        if entry is not None and not count_run:
+            return entry[0]
+        if entry is not None:
+            ast, optimized_ast, runs = entry
+            if optimized_ast is None and runs >= self.HOT_RUN_THRESHOLD:
+                # Code that keeps being run gets constant folding and dead branch removal
+                optimized_ast = self.dorolang_interpreter.optimize(ast)
+                entry[1] = optimized_ast
+            return optimized_ast if optimized_ast is not None else ast
+
+        with self.lexer_lock:
+            self.lexer.reset(code)
+            tokens = self.lexer.tokenize_by_line()
+        
+        parser = Parser(tokens)
+        ast = parser.parse()
+
+        # Only the parse result is cached, programs still execute on every run.
+        # Entries are [ast, optimized_ast, runs]
+        with self.ast_cache_lock:
+            self.ast_cache[key] = [ast, None, 1 if count_run else 0]
+            if len(self.ast_cache) > self.AST_CACHE_SIZE:
+                self.ast_cache.popitem(last=False)
+        return ast
+
+    def _highlight_current_error_line(self, line_number):
+        """Highlights error line in active editor, safe to call from execution threads"""
+        if threading.current_thread() is not threading.main_thread():
+            self.call_in_ui(self._highlight_current_error_line, line_number)
+            return
+
+        editor = self.get_current_editor()
+        if editor:
+            self._highlight_error_line(editor, line_number)
+
+    def call_in_ui(self, func, *args):
+        """Queues func(*args) to run on the Tk thread; for use from execution threads"""
+        self.ui_calls.put((func, args))
+
+    def _poll_ui_calls(self):
+        """Runs calls queued by execution threads and re-arms itself; runs on the Tk thread"""
+        while True:
+            try:
+                func, args = self.ui_calls.get_nowait()
+            except queue.Empty:
+                break
+            try:
+                func(*args)
+            except Exception as e:
+                print(f"UI call error: {e}")
+        self.after(self.UI_POLL_INTERVAL, self._poll_ui_calls)
+
     def _highlight_error_line(self, editor, line_number):
         """Highlights error line in editor"""
         try:
@@ -1108,7 +1272,8 @@ F9            - Run selection
     def reset_interpreter(self):
         """Reset interpreter"""
         try:
-            self.dorolang_interpreter.reset()
+            # Queued behind any running program, so a run never sees half-reset state
+            self.run_queue.put(self.dorolang_interpreter.reset)
             self.console.clear()
             self.console.write_info("Interpreter variables reset")
         except Exception as e:
@@ -1120,6 +1285,7 @@ F9            - Run selection
         new_theme = self.theme_var.get()
         if new_theme != self.current_theme:
             self.current_theme = new_theme
+            self.settings_dirty = True
             self.apply_theme()
             print(f"Theme switched to: {new_theme}")
 
@@ -1173,12 +1339,14 @@ F9            - Run selection
                 editor.is_modified = False
                 
                 # Add to recent files
-                if file_path in self.recent_files:
-                    self.recent_files.remove(file_path)
-                self.recent_files.insert(0, file_path)
-                self.recent_files = self.recent_files[:20]  # Keep max 20 recent files
-                self.update_recent_files_menu()
-                self.save_settings()
+                if not self.recent_files or self.recent_files[0] != file_path:
+                    if file_path in self.recent_files:
+                        self.recent_files.remove(file_path)
+                    self.recent_files.insert(0, file_path)
+                    self.recent_files = self.recent_files[:20]  # Keep max 20 recent files
+                    self.settings_dirty = True
+                    self.update_recent_files_menu()
+                    self.save_settings()
             elif is_template:
                 self.apply_welcome_template(editor)
                 editor.is_modified = False # Template doesn't count as modification
@@ -1283,6 +1451,8 @@ F9            - Run selection
     
     def save_settings(self):
         """Save settings"""
+        if not self.settings_dirty:
+            return # Nothing changed since last load or save
         try:
             settings_file = "dorolang_ide_settings.json"
             settings = {
@@ -1290,35 +1460,22 @@ F9            - Run selection
                 'theme': self.current_theme,
                 'last_opened_folder': self.last_opened_folder
             }
+            # Encode up front and write once; json.dump issues a write per chunk.
+            # Without indent the C encoder is used; readable output only for debugging
+            if DEBUG_MODE:
+                data = json.dumps(settings, ensure_ascii=False, indent=2)
+            else:
+                data = json.dumps(settings, separators=(',', ':'))
             with open(settings_file, 'w', encoding='utf-8') as f:
-                json.dump(settings, f, ensure_ascii=False, indent=2)
+                f.write(data)
+            self.settings_dirty = False
         except Exception as e:
             print(f"Error saving settings: {e}")
     
     def show_about(self):
         """About"""
         try:
-            mode_info = "Full Mode" if DOROLANG_MODULES_OK else "Demo Mode"
-            about_text = f"""DoroLang IDE
-Mode: {mode_info}
-
-Integrated Development Environment 
-for DoroLang Programming Language
-
-Author: Dorofii Karnaukh
-Year: 2024-2025
-
-Key Features:
-✅ Full-featured editor with syntax highlighting
-✅ Multi-file support with tabs
-✅ File explorer with management (create/delete)
-✅ Light and dark themes
-✅ Interactive output console
-
-DoroLang - simple and powerful programming 
-language for learning!"""
-            
-            messagebox.showinfo("About", about_text)
+            messagebox.showinfo("About", ABOUT_TEXT)
         except Exception as e:
             print(f"Ошибка показа о программе: {e}")
     
@@ -1330,9 +1487,11 @@ language for learning!"""
                 if not self.check_save_changes(editor):
                     return # User pressed "Cancel"
             self.save_settings()
+            self.run_queue.put(None)
             self.destroy()
         except Exception as e:
             print(f"Error closing application: {e}")
+            self.run_queue.put(None)
             self.destroy()  # Force close
     
     def run(self):
@@ -1366,10 +1525,13 @@ def main():
                 print("⚠️ Failed to set DPI-awareness (ctypes module or function not found).")
         # --- END IMPROVEMENT ---
 
-        # System diagnostics
+        # System diagnostics (the directory listing can be slow, so only on request)
         print(f"Python version: {sys.version}")
         print(f"Working directory: {os.getcwd()}")
-        print(f"Files in directory: {os.listdir('.')}")
+        if DEBUG_MODE:
+            # Only the first entries; the directory may be huge
+            with os.scandir('.') as entries:
+                print(f"Files in directory (first 20): {[entry.name for entry in itertools.islice(entries, 20)]}")
         
         # Check tkinter
         try:
@@ -1396,21 +1558,12 @@ def main():
         # Show error window if possible
         try:
             import tkinter.messagebox as mb
-            error_details = f"""Critical error launching Enhanced IDE:
-
-Error: {str(e)}
-
-Details:
-- Python: {sys.version}
-- Working directory: {os.getcwd()}
-- DoroLang modules: {'✅ OK' if DOROLANG_MODULES_OK else '❌ Not loaded'}
-
-Check:
-1. Are all required files in the folder?
-2. Are all dependencies installed?
-3. Console output for details
-
-Full traceback printed to console."""
+            error_details = CRITICAL_ERROR_TEMPLATE.format(
+                error=e,
+                python_version=sys.version,
+                working_dir=os.getcwd(),
+                modules_status='✅ OK' if DOROLANG_MODULES_OK else '❌ Not loaded'
+            )
             
             mb.showerror("Critical Error Enhanced DoroLang IDE", error_details)
         except:
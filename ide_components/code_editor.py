@@ -1,17 +1,52 @@
 import tkinter as tk
 from tkinter import scrolledtext
 import re
+import sys
 import traceback
+import functools
+import bisect
+import itertools
+import queue
+import threading
 
 class SyntaxHighlighter:
     """Enhanced syntax highlighting for DoroLang with support for new features"""
+
+    TAGS = ("keyword", "logical", "boolean", "string", "number", "comment", "operator", "delimiter", "input")
+
+    KEYWORDS = ('say', 'kas', 'if', 'else', 'while', 'for', 'function', 'return', 'input', 'to', 'step')
+    LOGICAL_OPS = ('and', 'or', 'not')
+    BOOLEAN_VALUES = ('true', 'false')
+    # Every reserved word, shared with autocomplete
+    LANGUAGE_WORDS = frozenset(KEYWORDS + LOGICAL_OPS + BOOLEAN_VALUES)
+
+    # Lines per block of a full pass; blocks in view are tagged first
+    HIGHLIGHT_BLOCK = 200
+
+    # One background thread tokenizes for all editors; only tagging runs on the Tk thread
+    scan_requests = queue.Queue()
+    scan_worker = None
+    POLL_INTERVAL = 16 # ms between checks for finished scans, roughly one frame
     
     def __init__(self, text_widget, initial_colors):
         self.text_widget = text_widget
         self.colors = initial_colors
         self.setup_tags()
-        self.compile_regex()
         self.highlight_job = None
+        self.generation = 0
+        # Lines edited since the last applied highlight; anything that may touch
+        # more than one line (paste, undo, line count change) sets full_pending
+        self.dirty_lines = set()
+        self.full_pending = True
+        self.line_count = 0
+        # Hash of the text the current tags were built from (None after a partial pass)
+        self.content_hash = None
+        self.pending_hash = None
+        # The tokenizer thread never calls Tk: it answers every request on this
+        # queue, which the Tk thread polls while scans are in flight
+        self.scan_results = queue.Queue()
+        self.scans_in_flight = 0
+        self.poll_job = None
 
     def setup_tags(self):
         """Setup tags for highlighting"""
@@ -32,35 +67,65 @@ class SyntaxHighlighter:
         except Exception as e:
             print(f"Warning: Error setting up highlight tags: {e}")
     
-    def compile_regex(self):
-        """Compile regular expression with support for new tokens"""
-        keywords = ['say', 'kas', 'if', 'else', 'while', 'for', 'function', 'return', 'input', 'to', 'step']
-        logical_ops = ['and', 'or', 'not']
-        boolean_values = ['true', 'false']
-
-        keyword_pattern = r'\b(' + '|'.join(keywords) + r')\b'
-        input_pattern = r'\binput\b'
-        logical_pattern = r'\b(' + '|'.join(logical_ops) + r')\b'
-        boolean_pattern = r'\b(' + '|'.join(boolean_values) + r')\b'
-
+    @classmethod
+    def compile_regex(cls):
+        """Compile regular expression with support for new tokens (once, shared by all editors)"""
+        # Words are matched by one pattern and classified with a table lookup,
+        # instead of trying every keyword alternation before IDENTIFIER
+        cls.word_tags = {}
+        cls.word_tags.update((word, "keyword") for word in cls.KEYWORDS)
+        cls.word_tags["input"] = "input"
+        cls.word_tags.update((word, "logical") for word in cls.LOGICAL_OPS)
+        cls.word_tags.update((word, "boolean") for word in cls.BOOLEAN_VALUES)
+
+        # The kinds start with different characters, so their order only affects
+        # speed: the most frequent comes first. There is no catch-all group,
+        # finditer simply steps over characters that start no token
         token_patterns = [
-            ('COMMENT', r'#.*$'),
-            ('STRING', r'(\".*?\"|\'.*?\')'),
-            ('NUMBER', r'\b\d+\.?\d*\b'),
-            ('BOOLEAN', boolean_pattern),
-            ('LOGICAL', logical_pattern),
-            ('INPUT', input_pattern),
-            ('KEYWORD', keyword_pattern),
+            ('WORD', r'\b[a-zA-Z_][a-zA-Z0-9_]*\b'),
             ('OPERATOR', r'==|!=|<=|>=|[+\-*/%=<>]'),
             ('DELIMITER', r'[(){}]'),
-            ('IDENTIFIER', r'[a-zA-Z_][a-zA-Z0-9_]*'),
-            ('MISMATCH', r'.')
+            ('NUMBER', r'\b\d+\.?\d*\b'),
+            ('STRING', r'(\".*?\"|\'.*?\')'),
+            ('COMMENT', r'#.*$'),
         ]
 
-        self.regex = re.compile('|'.join(f'(?P<{name}>{pattern})' for name, pattern in token_patterns))
-
-    def highlight(self):
-        """Starts delayed syntax highlighting"""
+        cls.regex = re.compile('|'.join(f'(?P<{name}>{pattern})' for name, pattern in token_patterns))
+
+        # Highlight tag for each group number, so the hot loop can index by
+        # match.lastindex instead of looking up and lowercasing match.lastgroup.
+        # Tag names are interned, the same objects as the literals in TAGS, which
+        # only makes the per-tag range dict lookups a little faster
+        cls.group_tags = [None] * (cls.regex.groups + 1)
+        for name, group_number in cls.regex.groupindex.items():
+            tag_name = sys.intern(name.lower())
+            if tag_name in cls.TAGS:
+                cls.group_tags[group_number] = tag_name
+        cls.word_group = cls.regex.groupindex['WORD']
+
+    def highlight(self, line=None, line_delta=0):
+        """Starts delayed syntax highlighting of one edited line, or of the entire text
+
+        line_delta is how the edit may change the line count: 1 when a newline was
+        typed at the end of line, -1 when the following line was joined onto it
+        """
+        if line is None:
+            self.full_pending = True
+        else:
+            line_count = int(self.text_widget.index("end-1c").split('.')[0])
+            delta = line_count - self.line_count
+            if delta and (delta != line_delta or any(n > line for n in self.dirty_lines)):
+                # Lines moved in a way this edit does not explain
+                self.full_pending = True
+            self.line_count = line_count
+            # Tk tags move with the text, so only the split or joined line needs a re-scan
+            self.dirty_lines.add(line)
+            if line_delta > 0:
+                # Both halves of a split line; also when Enter replaced a selection
+                # spanning two lines and the line count stayed the same
+                self.dirty_lines.add(line + 1)
+        # Results of any scan still in flight now describe outdated text
+        self.generation += 1
         if self.highlight_job:
             self.text_widget.after_cancel(self.highlight_job)
         self.highlight_job = self.text_widget.after(100, self.apply_highlight)
@@ -71,61 +136,250 @@ class SyntaxHighlighter:
         self.setup_tags()
         self.highlight()
 
+    @staticmethod
+    @functools.lru_cache(maxsize=4096)
+    def scan_line(line):
+        """Returns (tag, start, end) spans of highlighted tokens in one line
+
+        Cached by line text for all editors, so unchanged lines skip the regex
+        on re-highlight; entries never go stale and survive loading another file.
+        Columns are strings, ready to be appended to a "line." index prefix
+        """
+        group_tags = SyntaxHighlighter.group_tags
+        word_group = SyntaxHighlighter.word_group
+        word_tags = SyntaxHighlighter.word_tags
+        spans = []
+        for match in SyntaxHighlighter.regex.finditer(line):
+            group = match.lastindex
+            tag_name = word_tags.get(match.group()) if group == word_group else group_tags[group]
+            if tag_name:
+                spans.append((tag_name, str(match.start()), str(match.end())))
+        return tuple(spans)
+
+    @classmethod
+    def start_scan_worker(cls):
+        """Starts the shared tokenizer thread on first use"""
+        if cls.scan_worker is None:
+            cls.scan_worker = threading.Thread(target=cls.scan_loop, daemon=True)
+            cls.scan_worker.start()
+
+    @classmethod
+    def scan_loop(cls):
+        """Tokenizes queued buffers and hands the spans back to the Tk thread"""
+        while True:
+            highlighter, generation, content, line_numbers = cls.scan_requests.get()
+            reply = None # Stale or failed requests are still answered, with None
+            if generation == highlighter.generation: # Otherwise a newer request follows
+                try:
+                    lines = content.split("\n")
+                    if line_numbers is None:
+                        # Entire text, cut into blocks that are tagged one at a time
+                        size = cls.HIGHLIGHT_BLOCK
+                        blocks = []
+                        for first in range(0, len(lines), size):
+                            block_lines = lines[first:first + size]
+                            ranges = cls.collect_ranges(range(first + 1, first + len(block_lines) + 1), block_lines)
+                            blocks.append((first + 1, first + len(block_lines), ranges))
+                        reply = (highlighter.apply_blocks, (generation, blocks))
+                    else:
+                        ranges = cls.collect_ranges(line_numbers, lines)
+                        reply = (highlighter.apply_spans, (generation, ranges, line_numbers))
+                except Exception as e:
+                    print(f"Ошибка подсветки синтаксиса: {e}")
+            highlighter.scan_results.put(reply)
+
+    @classmethod
+    def collect_ranges(cls, line_numbers, lines):
+        """Index pairs grouped per tag, so each tag is applied with one tag_add"""
+        ranges = {tag: [] for tag in cls.TAGS}
+        for line_num, line in zip(line_numbers, lines):
+            spans = cls.scan_line(line)
+            if spans:
+                prefix = f"{line_num}."
+                for tag_name, start, end in spans:
+                    ranges[tag_name] += (prefix + start, prefix + end)
+        return ranges
+
     def apply_highlight(self):
-        """Applies enhanced syntax highlighting to entire text"""
+        """Queues edited lines, or entire text, for highlighting on the tokenizer thread"""
+        try:
+            self.generation += 1
+            line_count = int(self.text_widget.index("end-1c").split('.')[0])
+            if line_count != self.line_count:
+                # Lines were added or removed without an edit that explains it
+                self.line_count = line_count
+                self.full_pending = True
+
+            if self.full_pending:
+                content = self.text_widget.get("1.0", tk.END)
+                line_numbers = None
+                content_hash = hash(content)
+                if content_hash == self.content_hash:
+                    # Text is identical to the last full pass (copy, theme change...), tags still fit
+                    self.full_pending = False
+                    self.dirty_lines.clear()
+                    return
+                self.pending_hash = content_hash
+            else:
+                line_numbers = tuple(sorted(self.dirty_lines))
+                if not line_numbers:
+                    return
+                content = "\n".join(self.text_widget.get(f"{n}.0", f"{n}.end") for n in line_numbers)
+
+            self.start_scan_worker()
+            self.scan_requests.put((self, self.generation, content, line_numbers))
+            self.scans_in_flight += 1
+            if self.poll_job is None:
+                self.poll_job = self.text_widget.after(self.POLL_INTERVAL, self.poll_results)
+        except Exception as e:
+            print(f"Ошибка подсветки синтаксиса: {e}")
+
+    def poll_results(self):
+        """Applies finished scans; runs on the Tk thread and re-arms while scans are in flight"""
+        self.poll_job = None
         try:
-            tags_to_remove = ["keyword", "logical", "boolean", "string", "number", "comment", "operator", "delimiter", "input"]
-            for tag in tags_to_remove:
-                self.text_widget.tag_remove(tag, "1.0", tk.END)
-
-            content = self.text_widget.get("1.0", tk.END)
-
-            for line_num, line in enumerate(content.splitlines(), 1):
-                for match in self.regex.finditer(line):
-                    kind = match.lastgroup
-                    tag_name = kind.lower() if kind else None
-                    if tag_name in tags_to_remove:
-                        start = match.start()
-                        end = match.end()
-                        start_index = f"{line_num}.{start}"
-                        end_index = f"{line_num}.{end}"
-                        self.text_widget.tag_add(tag_name, start_index, end_index)
+            while True:
+                try:
+                    reply = self.scan_results.get_nowait()
+                except queue.Empty:
+                    break
+                self.scans_in_flight -= 1
+                if reply:
+                    apply, args = reply
+                    apply(*args)
+        except Exception as e:
+            print(f"Ошибка подсветки синтаксиса: {e}")
+        if self.scans_in_flight:
+            self.poll_job = self.text_widget.after(self.POLL_INTERVAL, self.poll_results)
 
+    def apply_spans(self, generation, ranges, line_numbers):
+        """Applies per-tag index ranges of edited lines unless the text was edited in the meantime"""
+        if generation != self.generation:
+            return
+
+        try:
+            # Only the re-scanned lines lose their old tags. Tk's tag remove takes
+            # any number of index pairs, but Text.tag_remove passes on just one
+            line_ranges = []
+            for line_num in line_numbers:
+                line_ranges += (f"{line_num}.0", f"{line_num}.end")
+            widget = self.text_widget
+            for tag in self.TAGS:
+                widget.tk.call(widget._w, 'tag', 'remove', tag, *line_ranges)
+            self.dirty_lines.difference_update(line_numbers)
+            self.content_hash = None
+
+            self.add_ranges(ranges)
         except Exception as e:
             print(f"Ошибка подсветки синтаксиса: {e}")
 
+    def add_ranges(self, ranges):
+        """Tags per-tag index ranges; Tk's tag add takes any number of index pairs in one call"""
+        tag_add = self.text_widget.tag_add
+        for tag_name, indices in ranges.items():
+            if indices:
+                tag_add(tag_name, *indices)
+
+    def apply_blocks(self, generation, blocks):
+        """Applies a full pass block by block, starting with the part of the text in view"""
+        if generation != self.generation:
+            return
+
+        try:
+            top_line = int(self.text_widget.index("@0,0").split('.')[0])
+        except Exception:
+            top_line = 1
+        visible = (top_line - 1) // self.HIGHLIGHT_BLOCK
+        # The block at the top of the view and the one below it cover the screen
+        ordered = blocks[visible:visible + 2] + blocks[:visible] + blocks[visible + 2:]
+        self.apply_next_block(generation, ordered, 0)
+
+    def apply_next_block(self, generation, blocks, index):
+        """Tags one block, then yields to the event loop before the next one"""
+        if generation != self.generation:
+            return  # Edited meanwhile; full_pending stays set, so the next pass is full again
+
+        try:
+            if index == 0:
+                # From here on the tags match neither the old text nor, until the
+                # last block, the new one; an aborted pass must never count as unchanged
+                self.content_hash = None
+            first_line, last_line, ranges = blocks[index]
+            tag_remove = self.text_widget.tag_remove
+            for tag in self.TAGS:
+                tag_remove(tag, f"{first_line}.0", f"{last_line}.end")
+            self.add_ranges(ranges)
+
+            if index + 1 < len(blocks):
+                self.text_widget.after(1, self.apply_next_block, generation, blocks, index + 1)
+            else:
+                self.full_pending = False
+                self.dirty_lines.clear()
+                self.content_hash = self.pending_hash
+        except Exception as e:
+            print(f"Ошибка подсветки синтаксиса: {e}")
+
+
+SyntaxHighlighter.compile_regex()
+
 
 class AutocompleteWindow(tk.Toplevel):
-    """Dropdown window for autocomplete"""
-    def __init__(self, parent, matches, completion_callback, close_callback):
+    """Dropdown window for autocomplete
+
+    Created once per editor and hidden between uses, so showing it only
+    refills the listbox instead of building a new window
+    """
+    def __init__(self, parent, completion_callback):
         super().__init__(parent)
         self.completion_callback = completion_callback
-        self.close_callback = close_callback
+        self.visible = False
         
         self.overrideredirect(True)
+        self.withdraw()
 
         self.listbox = tk.Listbox(self, exportselection=False, font=("Consolas", 10))
         self.listbox.pack(fill=tk.BOTH, expand=True)
 
-        for item in matches:
-            self.listbox.insert(tk.END, item)
-        
-        if matches:
-            self.listbox.selection_set(0)
-
         self.listbox.bind("<Double-Button-1>", self.on_select)
         self.listbox.bind("<Return>", self.on_select)
-        self.listbox.bind("<Escape>", lambda e: self.destroy())
-        self.bind("<FocusOut>", lambda e: self.destroy())
+        self.listbox.bind("<Escape>", lambda e: self.hide())
+        self.bind("<FocusOut>", lambda e: self.hide())
+
+    def show(self, matches, x, y):
+        """Shows matches at screen position x, y"""
+        self.listbox.delete(0, tk.END)
+        self.listbox.insert(tk.END, *matches)
+        self.listbox.selection_set(0)
+        self.geometry(f"+{x}+{y}")
+        self.deiconify()
+        self.visible = True
+        self.listbox.focus_set()
+
+    def hide(self):
+        if self.visible:
+            self.visible = False
+            self.withdraw()
 
     def on_select(self, event=None):
         if self.listbox.curselection():
             value = self.listbox.get(self.listbox.curselection())
             self.completion_callback(value)
-        self.destroy()
+        self.hide()
 
 class CodeEditor:
     """Enhanced code editor with autocomplete support"""
+
+    # Keys that only move the cursor and never change the text
+    NAVIGATION_KEYS = frozenset(("Left", "Right", "Up", "Down", "Home", "End", "Prior", "Next",
+                                 "Shift_L", "Shift_R", "Control_L", "Control_R", "Alt_L", "Alt_R",
+                                 "Caps_Lock", "Escape"))
+
+    # Autocomplete data built once: words sorted for bisect prefix lookup
+    COMPLETION_WORDS = sorted(SyntaxHighlighter.LANGUAGE_WORDS)
+    VARIABLE_PATTERN = re.compile(r'\bkas\s+([a-zA-Z_][a-zA-Z0-9_]*)\s*=')
+    WORD_BEFORE_CURSOR = re.compile(r'\w+$')
+    MAX_COMPLETIONS = 50 # Entries shown in the dropdown at most
+    BRACKET_SCAN_LIMIT = 100000 # Characters searched for a matching bracket
     
     def __init__(self, parent, initial_colors):
         self.parent = parent
@@ -134,6 +388,12 @@ class CodeEditor:
         self.is_modified = False
         self.colors = initial_colors
         self.autocomplete_window = None
+        self.gutter_width = 4
+        self.line_count = 0 # Lines currently shown in the gutter
+        self.scroll_top = None # First visible fraction, as last reported by Tk
+        self.variables_text = None # Text the cached variable names were found in
+        self.variables = set()
+        self.bracket_job = None
         self.setup_editor()
     
     def setup_editor(self):
@@ -145,7 +405,7 @@ class CodeEditor:
             self.line_frame = tk.Frame(editor_frame, width=50)
             self.line_frame.pack(side=tk.LEFT, fill=tk.Y)
             
-            self.line_numbers = tk.Text(self.line_frame, width=4, padx=3, pady=3,
+            self.line_numbers = tk.Text(self.line_frame, width=self.gutter_width, padx=3, pady=3,
                                        state=tk.DISABLED,
                                        wrap=tk.NONE, font=("Consolas", 11))
             self.line_numbers.pack(fill=tk.BOTH, expand=True)
@@ -164,9 +424,12 @@ class CodeEditor:
             
             self.text_area.bind('<KeyRelease>', self.on_key_release)
             self.text_area.bind('<Button-1>', self.on_click)
-            self.text_area.bind('<MouseWheel>', self.on_mousewheel)
             self.text_area.bind('<<Modified>>', self.on_modified)
             self.text_area.bind('<Control-space>', self.show_autocomplete)
+            # Edits made by virtual events (menu Undo/Redo/Cut/Paste, middle-click paste)
+            # come without a key release; the widget binding runs before the edit itself
+            for event_name in ('<<Undo>>', '<<Redo>>', '<<Cut>>', '<<Paste>>', '<<PasteSelection>>'):
+                self.text_area.bind(event_name, lambda e: self.text_area.after_idle(self.text_changed))
 
             # Tag for bracket highlighting
             self.text_area.tag_configure("match")
@@ -205,24 +468,29 @@ class CodeEditor:
         """Shows autocomplete dropdown list with keywords and variables"""
         self._close_autocomplete()
         try:
-            keywords = ['say', 'kas', 'if', 'else', 'while', 'for', 'function', 'return', 'true', 'false', 'and', 'or', 'not', 'input', 'to', 'step']
-            
-            # Extract variables from current file
-            all_text = self.text_area.get("1.0", tk.END)
-            variable_pattern = r'\bkas\s+([a-zA-Z_][a-zA-Z0-9_]*)\s*='
-            variables = list(set(re.findall(variable_pattern, all_text)))
-            
-            current_pos = self.text_area.index(tk.INSERT)
-            line_start = current_pos.rsplit('.', 1)[0] + '.0'
-            line_text = self.text_area.get(line_start, current_pos)
-            
-            words = re.findall(r'\w+', line_text)
-            if words:
-                self.partial_word = words[-1]
+            # Word directly before the cursor
+            line_text = self.text_area.get("insert linestart", tk.INSERT)
+            word = self.WORD_BEFORE_CURSOR.search(line_text)
+            if word:
+                self.partial_word = word.group()
                 
-                # Match both keywords and variables
-                keyword_matches = [kw for kw in keywords if kw.startswith(self.partial_word)]
-                variable_matches = [var for var in variables if var.startswith(self.partial_word)]
+                # Extract variables from current file; repeated requests without
+                # edits in between reuse the last scan
+                all_text = self.text_area.get("1.0", tk.END)
+                if all_text != self.variables_text:
+                    self.variables = set(self.VARIABLE_PATTERN.findall(all_text))
+                    self.variables_text = all_text
+                variables = self.variables
+                
+                # Keywords sharing the prefix form one run in the sorted list
+                words = self.COMPLETION_WORDS
+                start = bisect.bisect_left(words, self.partial_word)
+                keyword_matches = list(itertools.takewhile(lambda kw: kw.startswith(self.partial_word),
+                                                           itertools.islice(words, start, None)))
+                # Filtering stops once the dropdown is full
+                variable_matches = list(itertools.islice(
+                    (var for var in variables if var.startswith(self.partial_word)),
+                    max(self.MAX_COMPLETIONS - len(keyword_matches), 0)))
                 
                 # Combine and sort (keywords first, then variables)
                 matches = keyword_matches + variable_matches
@@ -235,9 +503,9 @@ class CodeEditor:
                     x += self.text_area.winfo_rootx()
                     y += self.text_area.winfo_rooty() + height
 
-                    self.autocomplete_window = AutocompleteWindow(self.parent, matches, self._insert_completion, self._close_autocomplete)
-                    self.autocomplete_window.geometry(f"+{x}+{y}")
-                    self.autocomplete_window.listbox.focus_set()
+                    if self.autocomplete_window is None:
+                        self.autocomplete_window = AutocompleteWindow(self.parent, self._insert_completion)
+                    self.autocomplete_window.show(matches, x, y)
         except Exception as e:
             print(f"Autocomplete error: {e}")
 
@@ -247,6 +515,7 @@ class CodeEditor:
             start_pos = self.text_area.index(f"{tk.INSERT} - {len(self.partial_word)} chars")
             self.text_area.delete(start_pos, tk.INSERT)
             self.text_area.insert(tk.INSERT, value)
+            self.text_changed()
         except Exception as e:
             print(f"Ошибка вставки автодополнения: {e}")
         finally:
@@ -254,15 +523,17 @@ class CodeEditor:
 
     def _close_autocomplete(self, event=None):
         if self.autocomplete_window:
-            self.autocomplete_window.destroy()
-            self.autocomplete_window = None
+            self.autocomplete_window.hide()
     
     def sync_scroll(self, *args):
         """Synchronize scrolling of line numbers and text"""
         try:
             self.line_numbers.yview_moveto(args[0])
-            if hasattr(self.text_area, 'vbar'):
-                self.text_area.vbar.set(*args)
+            self.text_area.vbar.set(*args)
+            # The popup would no longer sit at the cursor once the view has moved
+            if self.autocomplete_window and self.autocomplete_window.visible and args[0] != self.scroll_top:
+                self._close_autocomplete()
+            self.scroll_top = args[0]
         except Exception as e:
             print(f"Ошибка синхронизации прокрутки: {e}")
     
@@ -270,11 +541,26 @@ class CodeEditor:
         """Update after key press"""
         try:
             self._close_autocomplete()
-            self.update_line_numbers()
-            self.highlight_matching_bracket()
-            self.highlighter.highlight()
-            if hasattr(self.parent, 'update_status'):
-                self.parent.update_status()
+            self.schedule_bracket_match()
+            if event is not None and event.keysym in self.NAVIGATION_KEYS:
+                pass  # Text is unchanged, no line numbers or highlighting to update
+            elif event is not None and not event.state & 0x4:  # No Control modifier
+                self.update_line_numbers()
+                line = int(self.text_area.index(tk.INSERT).split('.')[0])
+                if event.keysym in ("Return", "KP_Enter"):
+                    # The cursor line was split in two
+                    self.highlighter.highlight(line - 1, line_delta=1)
+                elif event.keysym in ("BackSpace", "Delete"):
+                    self.highlighter.highlight(line, line_delta=-1)
+                elif event.char and event.char.isprintable():
+                    # Plain typing only changes the cursor line
+                    self.highlighter.highlight(line)
+                else:
+                    self.highlighter.highlight()
+            else:
+                self.update_line_numbers()
+                self.highlighter.highlight()
+            self.request_status_update()
         except Exception as e:
             print(f"Ошибка обработки нажатия клавиши: {e}")
     
@@ -284,23 +570,38 @@ class CodeEditor:
             self._close_autocomplete()
             self.update_line_numbers()
             self.highlight_matching_bracket()
-            if hasattr(self.parent, 'update_status'):
-                self.parent.update_status()
+            self.request_status_update()
         except Exception as e:
             print(f"Ошибка обработки клика: {e}")
     
-    def on_mousewheel(self, event=None):
-        """Synchronize when scrolling with wheel"""
+    def schedule_bracket_match(self):
+        """Coalesces bracket matching for bursts of key presses"""
+        if self.bracket_job:
+            self.text_area.after_cancel(self.bracket_job)
+        self.bracket_job = self.text_area.after(50, self.highlight_matching_bracket)
+
+    def text_changed(self):
+        """Refreshes line numbers and highlighting after an edit that did not come from typing"""
         try:
-            self.text_area.yview_scroll(int(-1 * (event.delta / 120)), "units")
-            self._close_autocomplete()
-            return "break"
+            self.update_line_numbers()
+            self.highlighter.highlight()
+            self.request_status_update()
         except Exception as e:
-            print(f"Ошибка прокрутки: {e}")
+            print(f"Ошибка обновления после изменения текста: {e}")
+
+    def request_status_update(self):
+        """Asks the IDE window for a (debounced) cursor position update"""
+        app = self.text_area.winfo_toplevel()
+        if hasattr(app, 'schedule_status_update'):
+            app.schedule_status_update()
     
     def on_modified(self, event=None):
         """Text change handler"""
+        # Tk fires <<Modified>> only when its flag turns on, so this runs once per
+        # save cycle; mark_saved turns the flag off again
         try:
+            if not self.text_area.edit_modified():
+                return
             if not self.is_modified:
                 self.is_modified = True
                 if hasattr(self.parent, 'update_title'):
@@ -311,14 +612,27 @@ class CodeEditor:
     def update_line_numbers(self):
         """Update line numbers"""
         try:
-            self.line_numbers.config(state=tk.NORMAL)
-            self.line_numbers.delete("1.0", tk.END)
-            
-            line_count = int(self.text_area.index(tk.END).split('.')[0]) - 1
-            line_numbers_string = "\n".join(str(i) for i in range(1, line_count + 1))
+            line_count = int(self.text_area.index("end-1c").split('.')[0])
+            if line_count == self.line_count:
+                return
             
-            self.line_numbers.insert("1.0", line_numbers_string)
-            self.line_numbers.config(state=tk.DISABLED)
+            # Only the difference is added or removed, not the whole gutter
+            self.line_numbers.config(state=tk.NORMAL)
+            if self.line_count == 0:
+                self.line_numbers.insert("1.0", "\n".join(str(i) for i in range(1, line_count + 1)))
+            elif line_count > self.line_count:
+                self.line_numbers.insert("end-1c", "".join(f"\n{i}" for i in range(self.line_count + 1, line_count + 1)))
+            else:
+                self.line_numbers.delete(f"{line_count}.end", "end-1c")
+            self.line_count = line_count
+
+            # Widen the gutter only when the number of digits changes
+            gutter_width = max(4, len(str(line_count)))
+            if gutter_width != self.gutter_width:
+                self.gutter_width = gutter_width
+                self.line_numbers.config(width=gutter_width, state=tk.DISABLED)
+            else:
+                self.line_numbers.config(state=tk.DISABLED)
         except Exception as e:
             print(f"Ошибка обновления номеров строк: {e}")
     
@@ -330,17 +644,36 @@ class CodeEditor:
             print(f"Ошибка получения текста: {e}")
             return ""
     
+    def iter_text_chunks(self, chunk_lines=512):
+        """Yields all text in blocks of lines, so a save never copies the whole buffer at once"""
+        try:
+            last_line = int(self.text_area.index("end-1c").split('.')[0])
+            for start in range(1, last_line + 1, chunk_lines):
+                end = f"{start + chunk_lines}.0" if start + chunk_lines <= last_line else "end-1c"
+                yield self.text_area.get(f"{start}.0", end)
+        except Exception as e:
+            print(f"Ошибка получения текста: {e}")
+            raise
+    
     def set_text(self, text):
         """Set text"""
         try:
             self.text_area.delete("1.0", tk.END)
             self.text_area.insert("1.0", text)
+            # Loading text is not an edit: reset Tk's dirty flag so the queued
+            # <<Modified>> event is ignored by on_modified
+            self.text_area.edit_modified(False)
             self.update_line_numbers()
             self.highlighter.highlight()
             self.is_modified = False
         except Exception as e:
             print(f"Ошибка установки текста: {e}")
     
+    def mark_saved(self):
+        """Marks text as saved and re-arms Tk's modified flag for the next edit"""
+        self.is_modified = False
+        self.text_area.edit_modified(False)
+    
     def get_cursor_position(self):
         """Get cursor position"""
         try:
@@ -351,57 +684,57 @@ class CodeEditor:
 
     def highlight_matching_bracket(self, event=None):
         """Highlight matching brackets"""
-        self.text_area.tag_remove("match", "1.0", tk.END)
+        self.bracket_job = None
+        try:
+            self.text_area.tag_remove("match", "1.0", tk.END)
 
-        cursor_pos = self.text_area.index(tk.INSERT)
-        
-        # Check character before cursor
-        char_before = self.text_area.get(f"{cursor_pos}-1c", cursor_pos)
-        
-        # Check character after cursor
-        char_after = self.text_area.get(cursor_pos, f"{cursor_pos}+1c")
-
-        brackets = {'(': ')', '[': ']', '{': '}', ')': '(', ']': '[', '}': '{'}
-
-        if char_before in "()[]{}":
-            match_pos = self._find_bracket_match(f"{cursor_pos}-1c", brackets[char_before])
-            if match_pos:
-                self.text_area.tag_add("match", f"{cursor_pos}-1c", cursor_pos)
-                self.text_area.tag_add("match", match_pos, f"{match_pos}+1c")
-        elif char_after in "()[]{}":
-            match_pos = self._find_bracket_match(cursor_pos, brackets[char_after])
-            if match_pos:
-                self.text_area.tag_add("match", cursor_pos, f"{cursor_pos}+1c")
-                self.text_area.tag_add("match", match_pos, f"{match_pos}+1c")
+            cursor_pos = self.text_area.index(tk.INSERT)
+            
+            # Check character before cursor (empty at the start of the text)
+            char_before = self.text_area.get(f"{cursor_pos}-1c", cursor_pos)
+            
+            # Check character after cursor
+            char_after = self.text_area.get(cursor_pos, f"{cursor_pos}+1c")
+
+            brackets = {'(': ')', '[': ']', '{': '}', ')': '(', ']': '[', '}': '{'}
+
+            if char_before in brackets:
+                match_pos = self._find_bracket_match(f"{cursor_pos}-1c", brackets[char_before])
+                if match_pos:
+                    self.text_area.tag_add("match", f"{cursor_pos}-1c", cursor_pos)
+                    self.text_area.tag_add("match", match_pos, f"{match_pos}+1c")
+            elif char_after in brackets:
+                match_pos = self._find_bracket_match(cursor_pos, brackets[char_after])
+                if match_pos:
+                    self.text_area.tag_add("match", cursor_pos, f"{cursor_pos}+1c")
+                    self.text_area.tag_add("match", match_pos, f"{match_pos}+1c")
+        except Exception as e:
+            print(f"Ошибка подсветки скобок: {e}")
 
     def _find_bracket_match(self, start_pos, match_char):
         """Finds matching bracket"""
         start_char = self.text_area.get(start_pos, f"{start_pos}+1c")
         
+        # The text is fetched once and only bracket characters are visited,
+        # instead of one widget call per character
+        brackets = re.compile(f"[{re.escape(start_char + match_char)}]")
+        limit = self.BRACKET_SCAN_LIMIT
         if start_char in "([{": # Search forward
-            direction = 1
-            end_pos = tk.END
-            current_pos = f"{start_pos}+1c"
-        elif start_char in ")]}": # Search backward
-            direction = -1
-            end_pos = "1.0"
-            current_pos = f"{start_pos}-1c"
+            text = self.text_area.get(f"{start_pos}+1c", f"{start_pos}+{limit + 1}c")
+            sign = "+"
+        elif start_char in ")]}": # Search backward, over the text before it reversed
+            text = self.text_area.get(f"{start_pos}-{limit}c", start_pos)[::-1]
+            sign = "-"
         else:
             return None
 
         balance = 1
-        while True:
-            if direction == 1 and self.text_area.compare(current_pos, ">=", end_pos): break
-            if direction == -1 and self.text_area.compare(current_pos, "<", end_pos): break
-
-            char = self.text_area.get(current_pos)
-            if char == start_char:
+        for match in brackets.finditer(text):
+            if match.group() == start_char:
                 balance += 1
-            elif char == match_char:
+            else:
                 balance -= 1
             
             if balance == 0:
-                return current_pos
-
-            current_pos = f"{current_pos}{direction:+}c"
+                return self.text_area.index(f"{start_pos}{sign}{match.start() + 1}c")
         return None
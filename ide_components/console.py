@@ -1,14 +1,21 @@
 import tkinter as tk
 from tkinter import ttk, scrolledtext
-import re
+import itertools
+import queue
+import threading
 import traceback
 from ide_settings import THEMES
 
 class Console:
     """Enhanced console for output results"""
+
+    DRAIN_INTERVAL = 16 # ms, roughly one frame
+    DRAIN_BATCH = 256   # Queued writes inserted per drain
     
     def __init__(self, parent):
         self.frame = ttk.Frame(parent)
+        # Writes from worker threads wait here until the Tk thread drains them
+        self.pending_writes = queue.Queue()
         self.setup_console()
     
     def setup_console(self):
@@ -33,6 +40,9 @@ class Console:
                 state=tk.DISABLED
             )
             self.console_text.pack(fill=tk.BOTH, expand=True, padx=5, pady=5)
+
+            # The Tk thread polls the queue itself, so worker threads never call into Tk
+            self.console_text.after(self.DRAIN_INTERVAL, self.drain)
             
         except Exception as e:
             print(f"Ошибка настройки консоли: {e}")
@@ -55,28 +65,73 @@ class Console:
         self.console_text.tag_config("boolean", foreground=colors['console_boolean'])
         self.console_text.tag_config("number", foreground=colors['console_number'])
     
+    def detect_tag(self, text, tag):
+        """Picks boolean or number coloring for plain output text"""
+        if tag != "output":
+            return tag
+        lowered = text.lower()
+        if "true" in lowered or "false" in lowered:
+            return "boolean"
+        # Plain numeric values such as 42, -7 or 3.14, checked with str methods only
+        if text.strip().lstrip('-').replace('.', '', 1).isdigit():
+            return "number"
+        return tag
+
     def write(self, text, tag="output"):
         """Write text to console with enhanced formatting"""
+        self.write_many([(text, tag)])
+
+    def write_many(self, items):
+        """Write a batch of (text, tag) pieces with a single insert"""
+        # Tk widgets may only be touched from the main thread, so writes coming
+        # from an execution thread are queued and drained by the Tk event loop
+        if threading.current_thread() is not threading.main_thread():
+            self.pending_writes.put(items)
+            return
+
+        # Anything still queued was written earlier and goes first
+        self.insert_items(self.take_pending() + list(items))
+
+    def take_pending(self, limit=None):
+        """Collects queued (text, tag) pieces, at most limit writes"""
+        items = []
+        count = 0
+        while limit is None or count < limit:
+            try:
+                items.extend(self.pending_writes.get_nowait())
+            except queue.Empty:
+                break
+            count += 1
+        return items
+
+    def drain(self):
+        """Inserts queued writes in one go and re-arms itself; runs on the Tk thread"""
+        self.insert_items(self.take_pending(self.DRAIN_BATCH))
+        self.console_text.after(self.DRAIN_INTERVAL, self.drain)
+
+    def insert_items(self, items):
+        """Inserts (text, tag) pieces at the end with a single Text.insert"""
         try:
+            # Text.insert accepts alternating text and tag arguments; neighbouring
+            # pieces that end up with the same tag are joined into one run
+            insert_args = []
+            for tag, group in itertools.groupby(items, key=lambda item: self.detect_tag(*item)):
+                insert_args.append("".join(text for text, _ in group))
+                insert_args.append(tag)
+            if not insert_args:
+                return
+
             self.console_text.config(state=tk.NORMAL)
-            
-            if "true" in text.lower() or "false" in text.lower():
-                if tag == "output":
-                    tag = "boolean"
-            elif re.search(r'\d+', text):
-                if tag == "output" and not any(char.isalpha() for char in text if char not in "0123456789. "):
-                    tag = "number"
-            
-            self.console_text.insert(tk.END, text, tag)
+            self.console_text.insert(tk.END, *insert_args)
             self.console_text.see(tk.END)
             self.console_text.config(state=tk.DISABLED)
-            self.console_text.update()
         except Exception as e:
             print(f"Error writing to console: {e}")
-    
+
     def clear(self):
         """Clear console"""
         try:
+            self.take_pending() # Queued output predates the clear
             self.console_text.config(state=tk.NORMAL)
             self.console_text.delete("1.0", tk.END)
             self.console_text.config(state=tk.DISABLED)
@@ -106,6 +106,7 @@ class FindReplaceDialog(tk.Toplevel):
                (not self.match_case.get() and selected_text.lower() == query.lower()):
                 text_widget.delete(sel_start, sel_end)
                 text_widget.insert(sel_start, replacement)
+                self.editor.text_changed()
             self.find_next()
         except tk.TclError:
             self.find_next()
@@ -127,6 +128,9 @@ class FindReplaceDialog(tk.Toplevel):
             text_widget.insert(pos, replacement)
             start_pos = f"{pos}+{len(replacement)}c"
             count += 1
+
+        if count:
+            self.editor.text_changed()
             
         messagebox.showinfo("Replace All", f"Replaced {count} occurrences", parent=self)
         self.close_dialog()
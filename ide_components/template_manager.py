@@ -1,15 +1,13 @@
-class TemplateManager:
-    """Code template manager"""
-    
-    @staticmethod
-    def get_templates():
-        """Returns dictionary of available templates"""
-        return {
-            "Hello World": '''# Hello World in DoroLang
+from types import MappingProxyType
+
+
+# Built once at import and read-only, so every caller gets the same object
+TEMPLATES = MappingProxyType({
+    "Hello World": '''# Hello World in DoroLang
 say "Hello, DoroLang!"
 say "Welcome to the world of programming!"''',
-            
-            "Variables": '''# Working with variables
+    
+    "Variables": '''# Working with variables
 kas name = "Your name"
 kas age = 25
 kas is_student = true
@@ -17,8 +15,8 @@ kas is_student = true
 say "Name: " + name
 say "Age: " + age
 say "Student: " + is_student''',
-            
-            "Conditional Logic": '''# Conditional logic
+    
+    "Conditional Logic": '''# Conditional logic
 kas score = 85
 kas passed = score >= 60
 
@@ -31,8 +29,8 @@ if (passed) {
 }
 
 say "Final grade: " + grade''',
-            
-            "Complex Logic": '''# Complex logic
+    
+    "Complex Logic": '''# Complex logic
 kas temperature = 22
 kas is_sunny = true
 kas is_weekend = false
@@ -49,8 +47,8 @@ if (can_go_out) {
         say "Weather is good, but today is a workday"
     }
 }''',
-            
-            "Calculator": '''# Simple calculator
+    
+    "Calculator": '''# Simple calculator
 kas a = 15
 kas b = 7
 
@@ -66,8 +64,8 @@ say "Remainder: " + (a % b)
 say "A greater than B: " + (a > b)
 say "A equals B: " + (a == b)
 say "A not equal to B: " + (a != b)''',
-            
-            "Input Example": '''# Interactive input example
+    
+    "Input Example": '''# Interactive input example
 kas name = input("What is your name? ")
 kas age = input("How old are you? ")
 
@@ -80,8 +78,8 @@ if (age_num >= 18) {
 } else {
     say "You are a minor"
 }''',
-            
-            "Nested Conditionals": '''# Nested if-else example
+    
+    "Nested Conditionals": '''# Nested if-else example
 kas score = 85
 kas attendance = 90
 
@@ -102,8 +100,8 @@ if (score >= 90) {
         }
     }
 }''',
-            
-            "Logical Operators": '''# Logical operators demonstration
+    
+    "Logical Operators": '''# Logical operators demonstration
 kas x = 10
 kas y = 5
 kas z = 15
@@ -123,8 +121,8 @@ if (result1 and result2) {
 if (result1 or result3) {
     say "At least one condition is true"
 }''',
-            
-            "String Operations": '''# String operations
+    
+    "String Operations": '''# String operations
 kas first_name = "John"
 kas last_name = "Doe"
 kas full_name = first_name + " " + last_name
@@ -139,8 +137,8 @@ say greeting
 kas age = 25
 kas info = full_name + " is " + age + " years old"
 say info''',
-            
-            "While Loop": '''# While loop example
+    
+    "While Loop": '''# While loop example
 kas counter = 1
 
 while (counter <= 5) {
@@ -149,8 +147,8 @@ while (counter <= 5) {
 }
 
 say "Loop finished!"''',
-            
-            "For Loop": '''# For loop example
+    
+    "For Loop": '''# For loop example
 say "Counting from 1 to 10:"
 
 for kas i = 1 to 10 {
@@ -161,8 +159,8 @@ say "Counting backwards:"
 for kas j = 10 to 1 step -1 {
     say "Number: " + j
 }''',
-            
-            "Nested Loops": '''# Nested loops example
+    
+    "Nested Loops": '''# Nested loops example
 say "Multiplication table:"
 
 for kas i = 1 to 5 {
@@ -172,8 +170,8 @@ for kas i = 1 to 5 {
     }
     say "---"
 }''',
-            
-            "Loop with Conditionals": '''# Loops with conditionals
+    
+    "Loop with Conditionals": '''# Loops with conditionals
 say "Even numbers from 1 to 20:"
 
 for kas i = 1 to 20 {
@@ -191,8 +189,8 @@ while (num <= 30) {
     }
     kas num = num + 1
 }''',
-            
-            "Simple Function": '''# Simple function example
+    
+    "Simple Function": '''# Simple function example
 function greet(name) {
     return "Hello, " + name + "!"
 }
@@ -200,8 +198,8 @@ function greet(name) {
 say greet("Alice")
 say greet("Bob")
 say greet("Charlie")''',
-            
-            "Function with Parameters": '''# Function with multiple parameters
+    
+    "Function with Parameters": '''# Function with multiple parameters
 function add(a, b) {
     return a + b
 }
@@ -213,8 +211,8 @@ function multiply(x, y) {
 say "5 + 3 = " + add(5, 3)
 say "4 * 7 = " + multiply(4, 7)
 say "10 + 20 = " + add(10, 20)''',
-            
-            "Function with Conditionals": '''# Function using conditionals
+    
+    "Function with Conditionals": '''# Function using conditionals
 function max(a, b) {
     if (a > b) {
         return a
@@ -233,8 +231,8 @@ function min(x, y) {
 
 say "Max of 10 and 5: " + max(10, 5)
 say "Min of 10 and 5: " + min(10, 5)''',
-            
-            "Recursive Function": '''# Recursive function - factorial
+    
+    "Recursive Function": '''# Recursive function - factorial
 function factorial(n) {
     if (n <= 1) {
         return 1
@@ -245,8 +243,8 @@ function factorial(n) {
 
 say "Factorial of 5: " + factorial(5)
 say "Factorial of 7: " + factorial(7)''',
-            
-            "Function with Loops": '''# Function using loops
+    
+    "Function with Loops": '''# Function using loops
 function count_to_n(n) {
     for kas i = 1 to n {
         say i
@@ -263,8 +261,8 @@ function sum_numbers(n) {
 
 count_to_n(5)
 say "Sum of 1 to 10: " + sum_numbers(10)''',
-            
-            "Complete Program": '''# Complete program using all features
+    
+    "Complete Program": '''# Complete program using all features
 function calculate_grade(score) {
     if (score >= 90) {
         return "A"
@@ -291,8 +289,8 @@ function print_grades() {
 }
 
 print_grades()''',
-            
-            "Interactive Function": '''# Interactive program with functions
+    
+    "Interactive Function": '''# Interactive program with functions
 function greet_user(name, age) {
     kas greeting = "Hello, " + name + "! You are " + age + " years old."
     return greeting
@@ -308,8 +306,8 @@ if (user_age >= 18) {
 } else {
     say "You are a minor"
 }''',
-            
-            "Calculator Functions": '''# Calculator using functions
+    
+    "Calculator Functions": '''# Calculator using functions
 function add(a, b) {
     return a + b
 }
@@ -330,8 +328,8 @@ say "10 + 5 = " + add(10, 5)
 say "10 - 5 = " + subtract(10, 5)
 say "10 * 5 = " + multiply(10, 5)
 say "10 / 5 = " + divide(10, 5)''',
-            
-            "Function Examples": '''# Multiple function examples
+    
+    "Function Examples": '''# Multiple function examples
 function is_even(n) {
     kas remainder = n % 2
     return remainder == 0
@@ -353,5 +351,13 @@ say "Is 8 even? " + is_even(8)
 say "Is 7 even? " + is_even(7)
 say "Is 5 positive? " + is_positive(5)
 say "2 to the power of 3: " + power(2, 3)'''
-        }
+})
+
 
+class TemplateManager:
+    """Code template manager"""
+    
+    @staticmethod
+    def get_templates():
+        """Returns dictionary of available templates"""
+        return TEMPLATES
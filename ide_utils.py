@@ -52,4 +52,7 @@ class MockInterpreter:
     
     def get_variables(self):
         return self.variables.copy()
+    
+    def variable_count(self):
+        return len(self.variables)
 
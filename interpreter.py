@@ -18,6 +18,10 @@ from parser import ( # noqa: E402
 )
 
 
+# Marks a missing entry in the constant cache (None is a valid value)
+_NOT_CACHED = object()
+
+
 class RuntimeError(Exception):
     """Runtime exception"""
     def __init__(self, message: str):
@@ -84,8 +88,36 @@ class Interpreter:
     def __init__(self):
         self.environment = Environment()
         self.output: List[str] = []  # For storing program output
+        self.echo: bool = True  # Also print output lines to stdout as they are produced
         self.return_value: Any = None  # NEW: For return statements
         self.should_return: bool = False  # NEW: Flag for return
+        # id(node) -> value of operations the parser marked constant, so they
+        # are computed once per run instead of on every loop pass
+        self.constant_cache: Dict[int, Any] = {}
+        
+        # Node type -> handler tables. One dict lookup per node replaces the
+        # isinstance chains, which dominated tree-walking time in loops
+        self.statement_handlers = {
+            FunctionDefinition: self.execute_function_definition,
+            IfStatement: self.execute_if_statement,
+            WhileStatement: self.execute_while_statement,
+            ForStatement: self.execute_for_statement,
+            SayStatement: self.execute_say_statement,
+            AssignmentStatement: self.execute_assignment_statement,
+            BlockStatement: self.execute_block_statement,
+            ReturnStatement: self.execute_return_statement,
+        }
+        self.expression_handlers = {
+            NumberLiteral: self._evaluate_literal,
+            StringLiteral: self._evaluate_literal,
+            BooleanLiteral: self._evaluate_literal,
+            Identifier: self._evaluate_identifier,
+            BinaryOperation: self._evaluate_binary_operation,
+            UnaryOperation: self._evaluate_unary_operation,
+            ParenthesizedExpression: self._evaluate_parenthesized_expression,
+            InputCall: self._evaluate_input_call,
+            FunctionCall: self._evaluate_function_call,
+        }
     
     def interpret(self, program: Program) -> List[str]:
         """
@@ -101,43 +133,33 @@ class Interpreter:
             RuntimeError: On runtime errors
         """
         self.output = []
+        # Node ids are only stable while the program is alive
+        self.constant_cache.clear()
         
         try:
             for statement in program.statements:
                 self.execute_statement(statement)
         except RuntimeError as e:
             error_msg = f"❌ Runtime error: {e.message}"
-            print(error_msg)
+            if self.echo:
+                print(error_msg)
             self.output.append(error_msg)
         
         return self.output
     
     def execute_statement(self, statement: Statement) -> None:
         """Executes a statement"""
-        if isinstance(statement, FunctionDefinition):
-            self.execute_function_definition(statement)
-        elif isinstance(statement, IfStatement):
-            self.execute_if_statement(statement)
-        elif isinstance(statement, WhileStatement):
-            self.execute_while_statement(statement)
-        elif isinstance(statement, ForStatement):
-            self.execute_for_statement(statement)
-        elif isinstance(statement, SayStatement):
-            self.execute_say_statement(statement)
-        elif isinstance(statement, AssignmentStatement):
-            self.execute_assignment_statement(statement)
-        elif isinstance(statement, BlockStatement):
-            self.execute_block_statement(statement)
-        elif isinstance(statement, ReturnStatement):
-            self.execute_return_statement(statement)
-        else:
+        handler = self.statement_handlers.get(type(statement))
+        if handler is None:
             raise RuntimeError(f"Unknown statement type: {type(statement).__name__}")
+        handler(statement)
     
     def execute_say_statement(self, statement: SayStatement) -> None:
         """Executes say statement"""
         value = self.evaluate_expression(statement.expression)
         output_line = str(value)
-        print(output_line)
+        if self.echo:
+            print(output_line)
         self.output.append(output_line)
     
     def execute_assignment_statement(self, statement: AssignmentStatement) -> None:
@@ -260,40 +282,60 @@ class Interpreter:
         Raises:
             RuntimeError: On evaluation errors
         """
-        if isinstance(expression, NumberLiteral):
-            return expression.value
-        
-        elif isinstance(expression, StringLiteral):
-            return expression.value
-        
-        elif isinstance(expression, BooleanLiteral):
-            return expression.value
-        
-        elif isinstance(expression, Identifier):
-            return self.environment.get(expression.name)
-        
-        elif isinstance(expression, BinaryOperation):
-            left_val = self.evaluate_expression(expression.left)
-            right_val = self.evaluate_expression(expression.right)
-            return self.apply_binary_operation(left_val, expression.operator, right_val)
-        
-        elif isinstance(expression, UnaryOperation):
-            operand_val = self.evaluate_expression(expression.operand)
-            return self.apply_unary_operation(expression.operator, operand_val)
-        
-        elif isinstance(expression, ParenthesizedExpression):
-            return self.evaluate_expression(expression.expression)
-
-        # New: input() handling
-        elif isinstance(expression, InputCall):
-            prompt = self.evaluate_expression(expression.prompt)
-            return dorolang_input(str(prompt))
-        
-        # Function call handling
-        elif isinstance(expression, FunctionCall):
-            return self.call_function(expression.name, expression.arguments)
-
-        raise RuntimeError(f"Unknown expression type: {type(expression).__name__}")
+        handler = self.expression_handlers.get(type(expression))
+        if handler is None:
+            raise RuntimeError(f"Unknown expression type: {type(expression).__name__}")
+        return handler(expression)
+    
+    def _evaluate_literal(self, expression: Expression) -> Any:
+        """Number, string and boolean literals"""
+        return expression.value
+    
+    def _evaluate_identifier(self, expression: Identifier) -> Any:
+        """Variable lookup"""
+        return self.environment.get(expression.name)
+    
+    def _evaluate_binary_operation(self, expression: BinaryOperation) -> Any:
+        """Binary operation on evaluated operands"""
+        if expression.constant:
+            return self._evaluate_constant(expression)
+        left_val = self.evaluate_expression(expression.left)
+        right_val = self.evaluate_expression(expression.right)
+        return self.apply_binary_operation(left_val, expression.operator, right_val)
+    
+    def _evaluate_unary_operation(self, expression: UnaryOperation) -> Any:
+        """Unary operation on evaluated operand"""
+        if expression.constant:
+            return self._evaluate_constant(expression)
+        operand_val = self.evaluate_expression(expression.operand)
+        return self.apply_unary_operation(expression.operator, operand_val)
+    
+    def _evaluate_constant(self, expression: Expression) -> Any:
+        """Operation marked constant by the parser, computed once per run"""
+        value = self.constant_cache.get(id(expression), _NOT_CACHED)
+        if value is _NOT_CACHED:
+            if type(expression) is BinaryOperation:
+                value = self.apply_binary_operation(self.evaluate_expression(expression.left),
+                                                    expression.operator,
+                                                    self.evaluate_expression(expression.right))
+            else:
+                value = self.apply_unary_operation(expression.operator,
+                                                   self.evaluate_expression(expression.operand))
+            self.constant_cache[id(expression)] = value
+        return value
+    
+    def _evaluate_parenthesized_expression(self, expression: ParenthesizedExpression) -> Any:
+        """Expression in parentheses"""
+        return self.evaluate_expression(expression.expression)
+    
+    def _evaluate_input_call(self, expression: InputCall) -> Any:
+        """New: input() handling"""
+        prompt = self.evaluate_expression(expression.prompt)
+        return dorolang_input(str(prompt))
+    
+    def _evaluate_function_call(self, expression: FunctionCall) -> Any:
+        """Function call handling"""
+        return self.call_function(expression.name, expression.arguments)
     
     def _to_numeric(self, value: Any) -> Any:
         """
@@ -444,6 +486,130 @@ class Interpreter:
             return False
         return True
 
+    def optimize(self, program: Program) -> Program:
+        """
+        Returns an optimized copy of a program for repeated execution
+        
+        Folds operations on literal operands into literals and removes
+        if/while branches whose condition is a constant. Operations that
+        would fail at runtime (e.g. division by zero) are left in place so
+        the error is still reported when the program runs. The original
+        AST is not modified.
+        
+        Args:
+            program: Root AST node of the program
+            
+        Returns:
+            Program: Optimized program
+        """
+        return Program(self._optimize_statements(program.statements))
+    
+    def _optimize_statements(self, statements: List[Statement]) -> List[Statement]:
+        """Optimizes a statement list, dropping statements that can never run"""
+        optimized = []
+        for statement in statements:
+            statement = self._optimize_statement(statement)
+            if statement is not None:
+                optimized.append(statement)
+        return optimized
+    
+    def _optimize_statement(self, statement: Statement) -> Any:
+        """Optimizes a statement; returns None if it can never have an effect"""
+        if isinstance(statement, IfStatement):
+            condition = self._optimize_expression(statement.condition)
+            if self._is_literal(condition):
+                # Dead branch elimination
+                if self._is_truthy(condition.value):
+                    return self._optimize_statement(statement.then_branch)
+                if statement.else_branch is not None:
+                    return self._optimize_statement(statement.else_branch)
+                return None
+            else_branch = statement.else_branch
+            if else_branch is not None:
+                else_branch = self._optimize_statement(else_branch)
+            return IfStatement(condition, self._optimize_statement(statement.then_branch), else_branch)
+        elif isinstance(statement, BlockStatement):
+            return BlockStatement(self._optimize_statements(statement.statements))
+        elif isinstance(statement, WhileStatement):
+            condition = self._optimize_expression(statement.condition)
+            if self._is_literal(condition) and not self._is_truthy(condition.value):
+                return None
+            return WhileStatement(condition, self._optimize_statement(statement.body))
+        elif isinstance(statement, ForStatement):
+            step = self._optimize_expression(statement.step) if statement.step else None
+            return ForStatement(
+                statement.variable,
+                self._optimize_expression(statement.start),
+                self._optimize_expression(statement.end),
+                step,
+                self._optimize_statement(statement.body),
+            )
+        elif isinstance(statement, FunctionDefinition):
+            return FunctionDefinition(statement.name, statement.parameters,
+                                      self._optimize_statement(statement.body))
+        elif isinstance(statement, SayStatement):
+            return SayStatement(self._optimize_expression(statement.expression))
+        elif isinstance(statement, AssignmentStatement):
+            return AssignmentStatement(statement.identifier, self._optimize_expression(statement.expression))
+        elif isinstance(statement, ReturnStatement):
+            if statement.expression is None:
+                return statement
+            return ReturnStatement(self._optimize_expression(statement.expression))
+        return statement
+    
+    def _optimize_expression(self, expression: Expression) -> Expression:
+        """Folds constant sub-expressions into literals"""
+        if isinstance(expression, ParenthesizedExpression):
+            return self._optimize_expression(expression.expression)
+        
+        elif isinstance(expression, BinaryOperation):
+            left = self._optimize_expression(expression.left)
+            right = self._optimize_expression(expression.right)
+            if self._is_literal(left) and self._is_literal(right):
+                try:
+                    value = self.apply_binary_operation(left.value, expression.operator, right.value)
+                except RuntimeError:
+                    value = None
+                folded = self._make_literal(value)
+                if folded is not None:
+                    return folded
+            return BinaryOperation(left, expression.operator, right)
+        
+        elif isinstance(expression, UnaryOperation):
+            operand = self._optimize_expression(expression.operand)
+            if self._is_literal(operand):
+                try:
+                    value = self.apply_unary_operation(expression.operator, operand.value)
+                except RuntimeError:
+                    value = None
+                folded = self._make_literal(value)
+                if folded is not None:
+                    return folded
+            return UnaryOperation(expression.operator, operand)
+        
+        elif isinstance(expression, InputCall):
+            return InputCall(self._optimize_expression(expression.prompt))
+        
+        elif isinstance(expression, FunctionCall):
+            return FunctionCall(expression.name,
+                                [self._optimize_expression(arg) for arg in expression.arguments])
+        
+        return expression
+    
+    def _is_literal(self, expression: Expression) -> bool:
+        """Checks whether an expression is a constant literal"""
+        return isinstance(expression, (NumberLiteral, StringLiteral, BooleanLiteral))
+    
+    def _make_literal(self, value: Any) -> Any:
+        """Wraps a folded value into a literal node, None if it has no literal form"""
+        if isinstance(value, bool):
+            return BooleanLiteral(value)
+        if isinstance(value, (int, float)):
+            return NumberLiteral(value)
+        if isinstance(value, str):
+            return StringLiteral(value)
+        return None
+    
     def reset(self) -> None:
         """Resets interpreter state"""
         self.environment.clear()
@@ -455,6 +621,10 @@ class Interpreter:
         """Returns current variables"""
         return self.environment.variables.copy()
     
+    def variable_count(self) -> int:
+        """Returns number of current variables without copying them"""
+        return len(self.environment.variables)
+    
     def set_variable(self, name: str, value: Any) -> None:
         """Sets a variable (for interactive mode)"""
         self.environment.set(name, value)
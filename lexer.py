@@ -6,6 +6,7 @@ Author: Dorofii Karnaukh
 """
 
 import re
+import functools
 from enum import Enum, auto
 from dataclasses import dataclass
 from typing import List, Optional
@@ -77,6 +78,31 @@ class Token:
         return f"{self.type.name}({self.value}) at {self.line}:{self.column}"
 
 
+# Keywords are scanned as identifiers first and then looked up here,
+# instead of trying a separate regex for every keyword on each token
+KEYWORDS = {
+    'say': TokenType.SAY,
+    'kas': TokenType.KAS,
+    'if': TokenType.IF,
+    'while': TokenType.WHILE,
+    'for': TokenType.FOR,
+    'function': TokenType.FUNCTION,
+    'return': TokenType.RETURN,
+    'input': TokenType.INPUT,
+    'else': TokenType.ELSE,
+    'true': TokenType.TRUE,
+    'false': TokenType.FALSE,
+    'and': TokenType.AND,
+    'or': TokenType.OR,
+    'not': TokenType.NOT,
+}
+
+
+# Character classes for scanning identifiers without the regex patterns
+IDENTIFIER_START = frozenset('abcdefghijklmnopqrstuvwxyzABCDEFGHIJKLMNOPQRSTUVWXYZ_')
+IDENTIFIER_CHARS = IDENTIFIER_START | frozenset('0123456789')
+
+
 class LexerError(Exception):
     """Lexer exception"""
     def __init__(self, message: str, line: int, column: int):
@@ -93,61 +119,53 @@ class Lexer:
     Converts source code into a sequence of tokens
     """
     
+    # Token patterns (order matters!)
+    token_patterns = [
+        # Literals (numbers and identifiers are handled by scan_word)
+        (r'"(?:[^"\\]|\\.)*"', TokenType.STRING),
+        (r"'(?:[^'\\]|\\.)*'", TokenType.STRING),
+        
+        # Operators (two-character first)
+        (r'==', TokenType.EQ),
+        (r'!=', TokenType.NEQ),
+        (r'<=', TokenType.LTE),
+        (r'>=', TokenType.GTE),
+        (r'=', TokenType.ASSIGN), # Single-character = after ==
+        (r'\+', TokenType.PLUS),
+        (r'-', TokenType.MINUS),
+        (r'\*', TokenType.MULTIPLY),
+        (r'/', TokenType.DIVIDE),
+        (r'%', TokenType.MODULO),
+        (r'<', TokenType.LT),
+        (r'>', TokenType.GT),
+        
+        # Delimiters
+        (r'\(', TokenType.LPAREN),
+        (r'\)', TokenType.RPAREN),
+        (r'\{', TokenType.LBRACE),
+        (r'\}', TokenType.RBRACE),
+        (r',', TokenType.COMMA),  # NEW
+        
+        # Special
+        (r'\n', TokenType.NEWLINE),
+    ]
+    
+    # All patterns as one alternation, compiled once for every Lexer; alternatives
+    # are tried left to right, so the order above still decides.
+    # Group n belongs to pattern n - 1
+    token_regex = re.compile('|'.join(f'({pattern})' for pattern, _ in token_patterns))
+    group_types = [None] + [token_type for _, token_type in token_patterns]
+    
     def __init__(self, source_code: str):
+        self.reset(source_code)
+    
+    def reset(self, source_code: str) -> None:
+        """Prepares lexer for new source code, so one instance can be reused"""
         self.source = source_code
         self.position = 0
         self.line = 1
         self.column = 1
         self.tokens: List[Token] = []
-        
-        # Token patterns (order matters!)
-        self.token_patterns = [
-            # Keywords (must be before identifiers)
-            (r'say\b', TokenType.SAY),
-            (r'kas\b', TokenType.KAS),
-            (r'if\b', TokenType.IF),
-            (r'while\b', TokenType.WHILE),
-            (r'for\b', TokenType.FOR),
-            (r'function\b', TokenType.FUNCTION),  # NEW
-            (r'return\b', TokenType.RETURN),      # NEW
-            (r'input\b', TokenType.INPUT),
-            (r'else\b', TokenType.ELSE),
-            (r'true\b', TokenType.TRUE),
-            (r'false\b', TokenType.FALSE),
-            (r'and\b', TokenType.AND),
-            (r'or\b', TokenType.OR),
-            (r'not\b', TokenType.NOT),
-            
-            # Literals
-            (r'\d+\.?\d*', TokenType.NUMBER),
-            (r'"(?:[^"\\]|\\.)*"', TokenType.STRING),
-            (r"'(?:[^'\\]|\\.)*'", TokenType.STRING),
-            (r'[a-zA-Z_][a-zA-Z0-9_]*', TokenType.IDENTIFIER),
-            
-            # Operators (two-character first)
-            (r'==', TokenType.EQ),
-            (r'!=', TokenType.NEQ),
-            (r'<=', TokenType.LTE),
-            (r'>=', TokenType.GTE),
-            (r'=', TokenType.ASSIGN), # Single-character = after ==
-            (r'\+', TokenType.PLUS),
-            (r'-', TokenType.MINUS),
-            (r'\*', TokenType.MULTIPLY),
-            (r'/', TokenType.DIVIDE),
-            (r'%', TokenType.MODULO),
-            (r'<', TokenType.LT),
-            (r'>', TokenType.GT),
-            
-            # Delimiters
-            (r'\(', TokenType.LPAREN),
-            (r'\)', TokenType.RPAREN),
-            (r'\{', TokenType.LBRACE),
-            (r'\}', TokenType.RBRACE),
-            (r',', TokenType.COMMA),  # NEW
-            
-            # Special
-            (r'\n', TokenType.NEWLINE),
-        ]
     
     def current_char(self) -> Optional[str]:
         """Returns current character or None if end reached"""
@@ -181,10 +199,52 @@ class Lexer:
     def skip_comment(self) -> None:
         """Skips comments starting with #"""
         if self.current_char() == '#':
-            # Skip until end of line
-            while (self.current_char() is not None and 
-                   self.current_char() != '\n'):
-                self.advance()
+            # Jump straight to end of line, a comment never contains a newline
+            end = self.source.find('\n', self.position)
+            if end == -1:
+                end = len(self.source)
+            self.column += end - self.position
+            self.position = end
+
+    def scan_word(self) -> Optional[Token]:
+        """
+        Scans a number, identifier or keyword at current position
+        
+        Character runs are walked with string methods and set lookups
+        instead of the regex patterns. Equivalent to \\d+\\.?\\d* for
+        numbers and [a-zA-Z_][a-zA-Z0-9_]* for identifiers.
+        
+        Returns:
+            Optional[Token]: Scanned token, or None if no word starts here
+        """
+        source = self.source
+        length = len(source)
+        start = end = self.position
+        char = source[start]
+        
+        if char in IDENTIFIER_START:
+            while end < length and source[end] in IDENTIFIER_CHARS:
+                end += 1
+            value = source[start:end]
+            token_type = KEYWORDS.get(value, TokenType.IDENTIFIER)
+        elif char.isdecimal():
+            while end < length and source[end].isdecimal():
+                end += 1
+            if end < length and source[end] == '.':
+                end += 1
+                while end < length and source[end].isdecimal():
+                    end += 1
+            value = source[start:end]
+            token_type = TokenType.NUMBER
+        else:
+            return None
+        
+        # Words never contain newlines, so only the column moves
+        token = Token(token_type, value, self.line, self.column)
+        self.column += end - start
+        self.position = end
+        return token
+    
     def tokenize(self) -> List[Token]:
         """
         Main tokenization method
@@ -209,27 +269,27 @@ class Lexer:
                 self.skip_comment()
                 continue
             
-            # Save current position for token
-            token_line = self.line
-            token_column = self.column
-            # Try to find match with regular expressions
-            found_match = False
-            remaining_source = self.source[self.position:]
-            
-            for pattern, token_type in self.token_patterns:
-                match = re.match(pattern, remaining_source)
-                if match:
-                    token_value = match.group(0)
-                    self.tokens.append(Token(token_type, token_value, token_line, token_column))
-                    
-                    # Move position
-                    for _ in range(len(token_value)):
-                        self.advance()
-                    
-                    found_match = True
-                    break
+            # Numbers, identifiers and keywords
+            token = self.scan_word()
+            if token:
+                self.tokens.append(token)
+                continue
             
-            if not found_match:
+            # Match at current position without copying the rest of the source
+            match = self.token_regex.match(self.source, self.position)
+            if match:
+                token_value = match.group(0)
+                self.tokens.append(Token(self.group_types[match.lastindex], token_value, self.line, self.column))
+                
+                # Move position; strings may span lines
+                newlines = token_value.count('\n')
+                if newlines:
+                    self.line += newlines
+                    self.column = len(token_value) - token_value.rfind('\n')
+                else:
+                    self.column += len(token_value)
+                self.position = match.end()
+            else:
                 # Unknown character
                 unknown_char = self.current_char()
                 raise LexerError(
@@ -241,6 +301,38 @@ class Lexer:
         self.tokens.append(Token(TokenType.EOF, '', self.line, self.column))
         return self.tokens
     
+    def tokenize_by_line(self) -> List[Token]:
+        """
+        Tokenizes line by line, reusing the tokens of lines seen before
+        
+        Gives the same tokens as tokenize(). Only edited lines are actually
+        lexed again, unchanged ones come from a cache keyed by line text.
+        Source where a line cannot be lexed on its own (a string spanning
+        lines, or an error) goes through tokenize() for exact results.
+        
+        Returns:
+            List[Token]: List of tokens
+            
+        Raises:
+            LexerError: On lexical analysis errors
+        """
+        try:
+            self.tokens = []
+            lines = self.source.split('\n')
+            for line_number, line in enumerate(lines, 1):
+                for token_type, value, column in _line_tokens(line):
+                    self.tokens.append(Token(token_type, value, line_number, column))
+                if line_number < len(lines):
+                    self.tokens.append(Token(TokenType.NEWLINE, '\n', line_number, len(line) + 1))
+            self.line = len(lines)
+            self.column = len(lines[-1]) + 1
+            self.position = len(self.source)
+            self.tokens.append(Token(TokenType.EOF, '', self.line, self.column))
+            return self.tokens
+        except LexerError:
+            self.reset(self.source)
+            return self.tokenize()
+    
     def print_tokens(self) -> None:
         """Pretty prints all tokens for debugging"""
         print("=== TOKENS ===")
@@ -248,6 +340,13 @@ class Lexer:
             print(f"{i:2}: {token}")
 
 
+@functools.lru_cache(maxsize=8192)
+def _line_tokens(line: str):
+    """(type, value, column) of every token in one line, without NEWLINE/EOF"""
+    tokens = Lexer(line).tokenize()
+    return tuple((token.type, token.value, token.column) for token in tokens[:-1])
+
+
 # Module testing
 if __name__ == "__main__":
     # Test code with new features
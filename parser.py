@@ -8,7 +8,7 @@ Author: Dorofii Karnaukh
 
 from abc import ABC, abstractmethod
 from typing import List, Optional
-from dataclasses import dataclass
+from dataclasses import dataclass, field
 
 # Import tokens from lexer
 from lexer import Token, TokenType
@@ -75,6 +75,11 @@ class BinaryOperation(Expression):
     left: Expression
     operator: str
     right: Expression
+    # Operands are literals or constant operations, so the value never changes
+    constant: bool = field(init=False, repr=False, compare=False)
+    
+    def __post_init__(self):
+        self.constant = is_constant_expression(self.left) and is_constant_expression(self.right)
     
     def __str__(self):
         return f"({self.left} {self.operator} {self.right})"
@@ -85,6 +90,11 @@ class UnaryOperation(Expression):
     """Unary operations: -x, +y, not condition"""
     operator: str
     operand: Expression
+    # Operand is a literal or a constant operation, so the value never changes
+    constant: bool = field(init=False, repr=False, compare=False)
+    
+    def __post_init__(self):
+        self.constant = is_constant_expression(self.operand)
     
     def __str__(self):
         return f"({self.operator}{self.operand})"
@@ -94,6 +104,14 @@ class UnaryOperation(Expression):
 class ParenthesizedExpression(Expression):
     expression: Expression
 
+
+def is_constant_expression(expression: Expression) -> bool:
+    """Checks whether an expression is a literal or an operation marked constant"""
+    while type(expression) is ParenthesizedExpression:
+        expression = expression.expression
+    return (isinstance(expression, (NumberLiteral, StringLiteral, BooleanLiteral))
+            or getattr(expression, 'constant', False))
+
 # New AST node for input
 @dataclass
 class InputCall(Expression):